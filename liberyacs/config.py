@@ -1,20 +1,234 @@
 from __future__ import annotations
 
+import ast
+import builtins
 import copy
+import functools
+import keyword
+import operator
+import re
+import sys
+from collections import deque
 from importlib import import_module
+from importlib.util import find_spec
 from pathlib import Path
-from typing import Any, Union
+from types import CodeType, ModuleType
+from typing import Any, Callable, Dict, Iterable, Tuple, Union
 
 import yaml
-from yacs.config import _VALID_TYPES
+
+try:
+    from yaml import CSafeDumper as _YamlDumper
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeDumper as _YamlDumper  # type: ignore[assignment]
+    from yaml import SafeLoader as _YamlLoader  # type: ignore[assignment]
+from yacs.config import _VALID_TYPES, _YAML_EXTS
 from yacs.config import CfgNode as _CfgNode
 from yacs.config import _assert_with_logging, _valid_type
 
-# Special keys used for dynamic configuration evaluation
-EXTRALIBS = 'extralibs'
-MODULE = 'module'
-NAME = 'name'
-KWARGS = 'kwargs'
+# Special keys used for dynamic configuration evaluation, explicitly interned so
+# that membership tests against interned keys can match by identity
+EXTRALIBS = sys.intern('extralibs')
+MODULE = sys.intern('module')
+NAME = sys.intern('name')
+KWARGS = sys.intern('kwargs')
+
+# Tasks of the evaluation traversal in CfgNode._eval
+_EVAL = 'eval'
+_EVAL_DICT = 'eval_dict'
+_EVAL_SEQ = 'eval_seq'
+_EVAL_STR = 'eval_str'
+_STORE = 'store'
+_BUILD_OBJECT = 'build_object'
+_BUILD_SEQ = 'build_seq'
+_LOAD_MODULE = 'load_module'
+
+# Evaluation task of a value by its exact type, subclasses of these containers and of str
+# are added on first use
+_EVAL_TASKS: Dict[type, str] = {
+    dict: _EVAL_DICT,
+    list: _EVAL_SEQ,
+    tuple: _EVAL_SEQ,
+    str: _EVAL_STR,
+    int: _STORE,
+    float: _STORE,
+    bool: _STORE,
+    type(None): _STORE,
+}
+
+
+@functools.lru_cache(maxsize=1024)
+def _compile_expr(src: str) -> CodeType:
+    '''
+    Compiles an expression string once so repeated evaluations can reuse the code object.
+
+    Args:
+        src (str): Source of the expression.
+
+    Returns:
+        CodeType: Compiled code object in `eval` mode.
+    '''
+    # Like eval, ignore leading spaces and tabs
+    return compile(src.lstrip(' \t'), '<liberyacs>', 'eval')
+
+
+# Kinds of expression strings returned by _classify_expr
+_LITERAL = 0
+_NAME = 1
+_EXPR = 2
+
+# First characters of strings that may be literals, e.g. `10`, `'text'` or `(1, 2)`
+_LITERAL_START = frozenset('\'"([{0123456789-+.')
+_LITERAL_NAMES = frozenset(('True', 'False', 'None'))
+
+_BUILTINS = vars(builtins)
+
+# Globals shared by evaluations in a module namespace, eval only adds `__builtins__` to it
+_EMPTY_GLOBALS: dict = {}
+
+
+@functools.lru_cache(maxsize=1024)
+def _classify_expr(src: str) -> int:
+    '''
+    Classifies an expression string with cheap character checks.
+
+    Args:
+        src (str): Source of the expression.
+
+    Returns:
+        int: `_LITERAL` if it may be a literal, `_NAME` if it is a single name, `_EXPR` otherwise.
+    '''
+    if src[:1] in _LITERAL_START or src in _LITERAL_NAMES:
+        return _LITERAL
+
+    if src.isascii() and src.isidentifier() and not keyword.iskeyword(src):
+        return _NAME
+
+    return _EXPR
+
+
+def _get_module(name: str) -> ModuleType:
+    '''
+    Gets a module, looking it up in `sys.modules` before going through the import system.
+
+    Args:
+        name (str): Name of the module.
+
+    Returns:
+        ModuleType: The module.
+    '''
+    module = sys.modules.get(name)
+    if module is None:
+        module = import_module(name)
+
+    return module
+
+
+class _LazyModule:
+    '''
+    Stands in for a module of `extralibs` and imports it on first attribute access, so
+    modules the configuration never uses are not imported.
+    '''
+    __slots__ = ('_name', '_module')
+
+    def __init__(self, name: str) -> None:
+        '''
+        Args:
+            name (str): Name of the module.
+
+        Raises:
+            ModuleNotFoundError: If the module cannot be found. Errors raised while executing
+                the module are only raised once it is used.
+        '''
+        # Finding the module imports its parent packages, but not the module itself
+        if find_spec(name) is None:
+            raise ModuleNotFoundError(f'No module named {name!r}', name=name)
+
+        self._name = name
+        self._module: Union[ModuleType, None] = None
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._load(), name)
+
+    def _load(self) -> ModuleType:
+        '''
+        Imports the module if it has not been imported yet.
+
+        Returns:
+            ModuleType: The module.
+        '''
+        if self._module is None:
+            self._module = _get_module(self._name)
+
+        return self._module
+
+
+# A module used as a value is imported and stored in place of its stand-in
+_EVAL_TASKS[_LazyModule] = _LOAD_MODULE
+
+
+# Object names that are plain (dotted) attribute paths, e.g. `datetime` or `path.join`
+_ATTR_PATH = re.compile(r'^[A-Za-z_][\w.]*$')
+
+
+@functools.lru_cache(maxsize=1024)
+def _attr_getter(name: str) -> Callable[[Any], Any]:
+    '''
+    Creates a getter resolving a dotted attribute path without compiling an expression.
+
+    Args:
+        name (str): Dotted attribute path.
+
+    Returns:
+        Callable: Getter taking the object to resolve the path on.
+    '''
+    return operator.attrgetter(name)
+
+
+def _resolve_name(module: ModuleType, name: str) -> Any:
+    '''
+    Resolves `name` in the namespace of `module`.
+
+    Args:
+        module (ModuleType): Module to resolve the name in.
+        name (str): Attribute path or expression.
+
+    Returns:
+        Any: The resolved object.
+    '''
+    if _ATTR_PATH.match(name):
+        try:
+            return _attr_getter(name)(module)
+        except AttributeError:
+            pass
+
+    # Not a plain attribute of the module (e.g., a builtin or an expression)
+    return eval(_compile_expr(name), _EMPTY_GLOBALS, vars(module))
+
+
+def _eval_task(value_type: type) -> str:
+    '''
+    Finds the evaluation task for values of a type missing from `_EVAL_TASKS`. Only subclasses
+    of dict, list, tuple and str (e.g., CfgNode) are recorded, so the table stays bounded.
+
+    Args:
+        value_type (type): Type of the value to evaluate.
+
+    Returns:
+        str: The evaluation task.
+    '''
+    if issubclass(value_type, dict):
+        task = _EVAL_DICT
+    elif issubclass(value_type, (list, tuple)):
+        task = _EVAL_SEQ
+    elif issubclass(value_type, str):
+        task = _EVAL_STR
+    else:
+        return _STORE
+
+    _EVAL_TASKS[value_type] = task
+    return task
 
 
 class CfgNode(_CfgNode):
@@ -39,15 +253,20 @@ class CfgNode(_CfgNode):
             CfgNode: A CfgNode instance with the loaded configuration.
         '''
         # Open and read the YAML file, loading it as a configuration object
-        with open(filepath, 'r') as f:
-            config = CfgNode.load_cfg(f)
+        with open(filepath, 'rb') as f:
+            if evaluate and Path(filepath).suffix in _YAML_EXTS:
+                # Build the configuration from the parsed YAML directly, without load_cfg
+                config = cls._load_and_eval(yaml.load(f, Loader=_YamlLoader))
+            else:
+                config = cls.load_cfg(f)
 
-        # Convert dictionary-like elements recursively to CfgNode instances
-        config = cls._convert_to_cfg_node(config)
+                # YAML files already load as a tree of CfgNode instances, other sources may not
+                if not isinstance(config, CfgNode):
+                    config = cls._convert_to_cfg_node(config)
 
-        if evaluate:
-            # Evaluate dynamic expressions
-            config = config.eval()
+                if evaluate:
+                    # Evaluate dynamic expressions
+                    config = config.eval()
 
         # Ensure the resulting object is of type CfgNode
         assert isinstance(config, CfgNode)
@@ -56,7 +275,9 @@ class CfgNode(_CfgNode):
     @classmethod
     def _convert_to_cfg_node(cls, data: Any) -> Any:
         '''
-        Recursively converts dictionary-like objects to instances of CfgNode.
+        Converts dictionary-like objects to instances of CfgNode, walking nested containers
+        with an explicit stack instead of recursion. Lists and plain tuples are rebuilt, so
+        only other values are shared with `data`.
 
         Args:
             data (Any): Data to be converted.
@@ -64,18 +285,47 @@ class CfgNode(_CfgNode):
         Returns:
             Any: Converted data as CfgNode or the same type if not applicable.
         '''
-        if isinstance(data, dict):
-            # Convert dictionary to CfgNode and recursively convert its values
-            cfg_node = cls()
-            for key, value in data.items():
-                cfg_node[key] = cls._convert_to_cfg_node(value)
-            return cfg_node
-        elif isinstance(data, list):
-            # Recursively convert list elements
-            return [cls._convert_to_cfg_node(item) for item in data]
-        else:
-            # Return the data unchanged if it is not a dict or list
-            return data
+        result = [data]
+        # Each entry is a container still to be converted and the slot it is stored in, or a
+        # pending tuple to build from its converted items once they are all done
+        stack: deque = deque([(result, 0, data, None)])
+
+        while stack:
+            parent, index, value, seq_type = stack.pop()
+
+            if seq_type is not None:
+                parent[index] = seq_type(value)
+                continue
+
+            if isinstance(value, dict):
+                # Convert dictionary to CfgNode, nested containers are converted later.
+                # The node is fresh, so its items are inserted directly on the dict.
+                container: Any = cls()
+                dict.update(container, value)
+                items: Iterable[Tuple[Any, Any]] = value.items()
+            elif isinstance(value, list) or type(value) is tuple:
+                container = list(value)
+                items = enumerate(container)
+
+                # Only plain tuples are rebuilt, subclasses (e.g., namedtuples) are kept as-is
+                if type(value) is tuple:
+                    stack.append((parent, index, container, tuple))
+            else:
+                continue
+
+            parent[index] = container
+            stack.extend([
+                (container, key, item, None) for key, item in items if isinstance(item, (dict, list, tuple))
+            ])
+
+        return result[0]
+
+    @classmethod
+    def _load_cfg_from_yaml_str(cls, str_obj: Union[str, bytes]) -> CfgNode:
+        '''
+        Loads a config from a YAML string encoding, using the libyaml parser when available.
+        '''
+        return cls(yaml.load(str_obj, Loader=_YamlLoader))
 
     @classmethod
     def _create_config_tree_from_dict(cls, dic: dict, key_list: list) -> dict:
@@ -88,14 +338,18 @@ class CfgNode(_CfgNode):
             key_list (list[str]): a list of names which index this CfgNode from the root.
                 Currently only used for logging purposes.
         '''
-        dic = copy.deepcopy(dic)
+        # Dicts, lists and tuples are rebuilt below, so the given dict is not deep-copied
+        # beforehand. Only values that are not containers are shared with it.
+        tree: Dict[Any, Any] = {}
         for k, v in dic.items():
             if isinstance(v, dict):
                 # Convert dict to CfgNode
-                dic[k] = cls(v, key_list=key_list + [k])
+                tree[k] = cls(v, key_list=key_list + [k])
             elif isinstance(v, (list, tuple)):
-                dic[k] = type(v)(cls(ele) if isinstance(ele, dict) else ele for ele in v)
-        return dic
+                tree[k] = type(v)(cls._convert_to_cfg_node(ele) for ele in v)
+            else:
+                tree[k] = v
+        return tree
 
     def __setattr__(self, name: str, value: Any) -> None:
         if self.is_frozen():
@@ -112,26 +366,40 @@ class CfgNode(_CfgNode):
 
         self[name] = self._convert_to_cfg_node(value)
 
-    def dump(self, **kwargs: Any) -> str:
-        '''Dump to a string.'''
+    def dump(self, validate: bool = True, **kwargs: Any) -> str:
+        '''
+        Dump to a string.
 
-        def convert_to_dict(cfg_node: Any, key_list: list) -> Any:
-            if not isinstance(cfg_node, CfgNode):
-                _assert_with_logging(
-                    _valid_type(cfg_node),
-                    'Key {} with value {} is not a valid type to dump; valid types: {}'.format(
-                        '.'.join(key_list), type(cfg_node), _VALID_TYPES
-                    ),
-                )
-                return cfg_node
-            else:
-                cfg_dict = dict(cfg_node)
-                for k, v in cfg_dict.items():
-                    cfg_dict[k] = convert_to_dict(v, key_list + [k])
-                return cfg_dict
+        Args:
+            validate (bool): Whether to check that every value is of a type that can be dumped.
+            **kwargs: Keyword arguments passed to yaml.dump.
+
+        Returns:
+            str: The configuration as a YAML string.
+        '''
+        self_as_dict: dict = {}
+        # Each entry is a node still to be converted, the dict it is converted into and its keys
+        stack: deque = deque([(self, self_as_dict, [])])
+
+        while stack:
+            cfg_node, cfg_dict, key_list = stack.pop()
+
+            for k, v in dict.items(cfg_node):
+                if isinstance(v, CfgNode):
+                    cfg_dict[k] = {}
+                    stack.append((v, cfg_dict[k], key_list + [k]))
+                    continue
+
+                if validate:
+                    _assert_with_logging(
+                        _valid_type(v),
+                        'Key {} with value {} is not a valid type to dump; valid types: {}'.format(
+                            '.'.join(key_list + [k]), type(v), _VALID_TYPES
+                        ),
+                    )
+                cfg_dict[k] = v
 
-        self_as_dict = convert_to_dict(self, [])
-        return yaml.safe_dump(self_as_dict, **kwargs)
+        return yaml.dump(self_as_dict, Dumper=_YamlDumper, **kwargs)
 
     def eval(self) -> CfgNode:
         '''
@@ -140,15 +408,49 @@ class CfgNode(_CfgNode):
         Returns:
             CfgNode: A new evaluated configuration.
         '''
-        config = org_config = self.clone()
+        # Only the top level is copied here, _eval copies nested nodes before updating them
+        return self._copy_node(self)._eval_in_place(copy_nodes=True)
+
+    @classmethod
+    def _load_and_eval(cls, data: Any) -> CfgNode:
+        '''
+        Builds and evaluates a configuration from parsed YAML data.
+
+        The whole tree is converted to CfgNode instances before it is evaluated, so values
+        can refer to dictionaries defined later in the file. The tree is not shared with
+        anything else, so its nodes are evaluated in place instead of being copied.
+
+        Args:
+            data (Any): Data loaded from a YAML file.
+
+        Returns:
+            CfgNode: The evaluated configuration.
+        '''
+        config = cls._convert_to_cfg_node(data) if data is not None else cls()
+        return config._eval_in_place(copy_nodes=False)
+
+    def _eval_in_place(self, copy_nodes: bool = True) -> CfgNode:
+        '''
+        Evaluates the values of this node in place.
+
+        Args:
+            copy_nodes (bool): Whether nested nodes are copied before they are updated.
+
+        Returns:
+            CfgNode: This node, evaluated.
+        '''
         extralibs = {}
 
+        # Local names for the lookups repeated for every library
+        module_key, name_key = MODULE, NAME
+        get_module = _get_module
+
         # Process the external libraries defined in the configuration
-        for alias, lib_info in config.pop(EXTRALIBS, {}).items():
+        for alias, lib_info in self.pop(EXTRALIBS, {}).items():
             if isinstance(lib_info, dict):
-                # Import a specific object from a module
-                module = lib_info.pop(MODULE, None)
-                name = lib_info.pop(NAME, None)
+                # Import a specific object from a module, leaving the entry untouched
+                module = lib_info.get(module_key)
+                name = lib_info.get(name_key)
 
                 if module is None or name is None:
                     raise ValueError(
@@ -156,67 +458,181 @@ class CfgNode(_CfgNode):
                         f'found {MODULE}: {module}, {NAME}: {name}.'
                     )
 
-                if lib_info:
-                    raise ValueError(f'Only {MODULE} and {NAME} are allowed, found {[key for key in lib_info.keys()]}.')
+                if lib_info.keys() - {module_key, name_key}:
+                    extra_keys = [key for key in lib_info.keys() if key not in (module_key, name_key)]
+                    raise ValueError(f'Only {MODULE} and {NAME} are allowed, found {extra_keys}.')
 
-                lib = getattr(import_module(module), name)
+                lib = getattr(get_module(module), name)
             else:
-                # Import the entire module
-                lib = import_module(lib_info)
+                # Import the entire module once it is used, unless it is already imported
+                lib = sys.modules.get(lib_info) or _LazyModule(lib_info)
 
             extralibs[alias] = lib  # Store the imported library
 
         # Evaluate the configuration with the imported libraries
-        config = CfgNode._eval(config, extralibs, org_config)
+        config = self._eval(self, extralibs, self, copy_nodes)
 
         return config
 
-    @staticmethod
-    def _eval(config: Any, global_context: dict, local_context: dict) -> Any:
+    @classmethod
+    def _eval(
+        cls,
+        config: Any,
+        global_context: dict,
+        local_context: dict,
+        copy_nodes: bool = True,
+    ) -> Any:
         '''
-        Recursively evaluates the configuration to resolve dynamic values.
+        Evaluates the configuration to resolve dynamic values.
+
+        The traversal is depth-first and uses an explicit stack. Dictionaries are turned into
+        CfgNode instances before their values are evaluated, so values can refer to their
+        already evaluated siblings. A CfgNode given as `config` is updated in place. Nested
+        ones are copied first if `copy_nodes` is set, so the tree they come from is left
+        intact. Dictionaries returned by an expression (and everything below them) are always
+        copied since they may be shared with other nodes. Objects and sequences are built by
+        a pending entry once all of their items have been evaluated.
 
         Args:
             config (Any): Configuration object to evaluate.
             global_context (dict): Global context for evaluation (e.g., imported modules).
             local_context (dict): Local context for evaluation (e.g., configuration itself).
+            copy_nodes (bool): Whether nested nodes of `config` are copied before they are
+                updated.
 
         Returns:
             Any: Evaluated configuration object.
         '''
-        if isinstance(config, dict):
-            initialized = (
-                len(config) == 2 and MODULE in config and NAME in config
-                or len(config) == 3 and MODULE in config and NAME in config and KWARGS in config
-            )
+        # Local names for the special keys checked on every dictionary
+        module_key, name_key, kwargs_key = MODULE, NAME, KWARGS
+        eval_tasks = _EVAL_TASKS
+        eval_str = cls._eval_str
+
+        result = [config]
+        # Entries are (task, value, target, key, extra), the outcome is stored in target[key].
+        # For values still to be evaluated, extra tells whether nested nodes must be copied.
+        stack: deque = deque([(_EVAL, config, result, 0, copy_nodes)])
+        push, extend, pop = stack.append, stack.extend, stack.pop
+
+        while stack:
+            task, value, target, key, extra = pop()
+
+            if task is _EVAL:
+                # Dispatch on the exact type of the value
+                task = eval_tasks.get(type(value)) or _eval_task(type(value))
+
+            if task is _STORE:
+                target[key] = value
+
+            elif task is _EVAL_STR:
+                value = eval_str(value, global_context, local_context)
+
+                # If the result is not a string, evaluate it further. It may be shared with
+                # other nodes (e.g., a reference to a sibling), so it is copied if needed.
+                push((_STORE if isinstance(value, str) else _EVAL, value, target, key, True))
+
+            elif task is _EVAL_DICT:
+                # Most dictionaries have no `module` key, so check it first
+                initialized = (
+                    module_key in value and name_key in value
+                    and (len(value) == 2 or len(value) == 3 and kwargs_key in value)
+                )
 
-            if initialized:
-                # Process dictionary configuration items
-                module = config.pop(MODULE, None)
-                name = config.pop(NAME, None)
+                if initialized:
+                    # Evaluate the arguments first, the object is constructed afterwards
+                    node = {kwargs_key: value[kwargs_key]} if kwargs_key in value else {}
+                    push((_BUILD_OBJECT, node, target, key, (value[module_key], value[name_key])))
+                else:
+                    node = cls._copy_node(value) if extra and value is not config else value
+                    target[key] = node
 
-            # Recursively evaluate dictionary values
-            for key, value in config.items():
-                config[key] = CfgNode._eval(value, global_context, local_context)
+                # Evaluate dictionary values in order
+                extend([(_EVAL, item, node, k, extra) for k, item in reversed(node.items())])
 
-            # If both module and name are specified, construct the object with kwargs
-            if initialized:
-                kwargs = config.pop(KWARGS, {})  # Extract arguments for the callable
-                config = eval(name, {}, vars(import_module(module)))(**kwargs)
-            elif not isinstance(config, CfgNode):
-                # Convert the dict back to a CfgNode if it is not already
-                config = CfgNode(config)
+            elif task is _EVAL_SEQ:
+                # Evaluate list or tuple items in order before rebuilding the sequence
+                items = list(value)
+                push((_BUILD_SEQ, items, target, key, type(value)))
+                extend([(_EVAL, items[i], items, i, extra) for i in range(len(items) - 1, -1, -1)])
 
-        elif isinstance(config, (list, tuple)):
-            # Recursively evaluate list or tuple items
-            config = type(config)(map(lambda ele: CfgNode._eval(ele, global_context, local_context), config))
+            elif task is _BUILD_OBJECT:
+                target[key] = cls._build_object(value, extra)
 
-        elif isinstance(config, str):
-            # Evaluate strings as expressions
-            config = eval(config, global_context, local_context)
+            elif task is _LOAD_MODULE:
+                target[key] = value._load()
 
-            # If the result is not a string, evaluate it further
-            if not isinstance(config, str):
-                config = CfgNode._eval(config, global_context, local_context)
+            else:
+                # The items are evaluated into a fresh list, only other sequences are rebuilt
+                target[key] = value if extra is list else extra(value)
 
-        return config
+        return result[0]
+
+    @classmethod
+    def _copy_node(cls, config: dict) -> CfgNode:
+        '''
+        Shallow-copies a dictionary into a CfgNode that evaluated values can be stored in.
+
+        Args:
+            config (dict): Dictionary or CfgNode to copy.
+
+        Returns:
+            CfgNode: The copy.
+        '''
+        if isinstance(config, CfgNode):
+            # Keep the state of the node (e.g., whether new keys are allowed), but give the
+            # copy its own deprecated and renamed keys instead of sharing them
+            node = copy.copy(config)
+            for attr, value in node.__dict__.items():
+                if isinstance(value, (set, dict)):
+                    node.__dict__[attr] = copy.copy(value)
+
+            return node
+
+        node = cls()
+        node.update(config)
+        return node
+
+    @staticmethod
+    def _build_object(config: dict, initializer: tuple) -> Any:
+        '''
+        Constructs the object described by a dictionary with `module` and `name`.
+
+        Args:
+            config (dict): Dictionary holding the evaluated `kwargs`, if any.
+            initializer (tuple): The `module` and `name` of the object to construct.
+
+        Returns:
+            Any: The constructed object.
+        '''
+        module, name = initializer
+        return _resolve_name(_get_module(module), name)(**config.get(KWARGS, {}))
+
+    @staticmethod
+    def _eval_str(config: str, global_context: dict, local_context: dict) -> Any:
+        '''
+        Evaluates a string value as an expression.
+
+        Args:
+            config (str): Expression to evaluate.
+            global_context (dict): Global context for evaluation (e.g., imported modules).
+            local_context (dict): Local context for evaluation (e.g., configuration itself).
+
+        Returns:
+            Any: Result of the expression.
+        '''
+        kind = _classify_expr(config)
+
+        if kind == _NAME:
+            # Resolve the name as eval would: configuration first, then libraries and builtins
+            for namespace in (local_context, global_context, _BUILTINS):
+                if config in namespace:
+                    return namespace[config]
+        elif kind == _LITERAL:
+            # Pure literals do not need the contexts
+            try:
+                return ast.literal_eval(config)
+            except (ValueError, TypeError, SyntaxError):
+                pass
+
+        # Undefined names are left to eval so that the usual NameError is raised
+        return eval(_compile_expr(config), global_context, local_context)
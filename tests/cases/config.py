@@ -1,7 +1,11 @@
 import datetime
+import sys
+from importlib import import_module
 
 import pytest
 
+from liberyacs import CfgNode
+
 from .case import Case
 
 
@@ -81,3 +85,135 @@ class UnwantedKeyExtralibCase(Case):
             match='Only .* and .* are allowed',
         ):
             self.load_config()
+
+
+class EvalKeepsOriginalCase(Case):
+    config_file = 'tests/configs/regular.yml'
+    evaluate = False
+
+    def check(self) -> None:
+        config = self.load_config()
+        original = config.clone()
+        evaluated = config.eval()
+
+        assert config == original
+
+        evaluated.register_deprecated_key('deprecated')
+        evaluated.list[4].register_renamed_key('old', 'new')
+
+        assert not config.__dict__[CfgNode.DEPRECATED_KEYS]
+        assert not config.list[4].__dict__[CfgNode.RENAMED_KEYS]
+
+
+class ModuleExtralibCase(Case):
+    config_file = 'tests/configs/module_extralib.yml'
+    evaluate = True
+
+    def check(self) -> None:
+        config = self.load_config()
+
+        assert config.hsv == (0.0, 1.0, 1)
+
+
+class MissingExtralibCase(Case):
+    config_file = 'tests/configs/missing_extralib.yml'
+    evaluate = True
+
+    def check(self) -> None:
+        with pytest.raises(ModuleNotFoundError):
+            self.load_config()
+
+
+class ForwardReferenceCase(Case):
+    config_file = 'tests/configs/forward_reference.yml'
+    evaluate = True
+
+    def check(self) -> None:
+        config = self.load_config()
+
+        assert config.nested_value == 10
+        assert config.listed_value == 20
+        assert config.copied_dict == config.later_dict
+        assert config.copied_dict is not config.later_dict
+        assert config.copied_dict.sub_dict is not config.later_dict.sub_dict
+        assert config == CfgNode.load(self.config_file, evaluate=False).eval()
+
+
+class SubmoduleExtralibCase(Case):
+    config_file = 'tests/configs/submodule_extralib.yml'
+    evaluate = True
+
+    def check(self) -> None:
+        for name in ['extralib_package.submodule', 'extralib_package']:
+            sys.modules.pop(name, None)
+
+        config = self.load_config()
+
+        import extralib_package.submodule
+
+        assert config.value == 1
+        assert extralib_package.submodule.VALUE == 1
+
+
+class BrokenExtralibCase(Case):
+    config_file = 'tests/configs/broken_extralib.yml'
+    evaluate = True
+
+    def check(self) -> None:
+        with pytest.raises(ImportError):
+            self.load_config()
+
+        with pytest.raises(ImportError):
+            import_module('extralib_broken_module')
+
+
+class LazyExtralibCase(Case):
+    config_file = 'tests/configs/lazy_extralib.yml'
+    evaluate = True
+
+    def check(self) -> None:
+        sys.modules.pop('extralib_lazy_module', None)
+
+        config = self.load_config()
+
+        assert config.value == 1
+        assert 'extralib_lazy_module' not in sys.modules
+
+        # Modules used as values are imported and stored themselves
+        config = CfgNode({
+            'module_value': 'lazy',
+            'module_tuple': '(lazy,)',
+            'extralibs': {'lazy': 'extralib_lazy_module'},
+        }).eval()
+        module = sys.modules['extralib_lazy_module']
+
+        assert config.module_value is module
+        assert config.module_tuple == (module,)
+
+
+class ExpressionCase(Case):
+    config_file = 'tests/configs/expression.yml'
+    evaluate = True
+
+    def check(self) -> None:
+        config = self.load_config()
+
+        assert config.padded_int == 10
+        assert config.builtin_func is len
+        assert config.keyword_expr is False
+        assert config.conditional_expr == 1
+        # `dict` is not an attribute of `datetime`, so it is looked up in the builtins
+        assert config.builtin_object == {'num_int': 10}
+
+        # Keywords are never looked up as names, even if they are keys of the configuration
+        with pytest.raises(SyntaxError):
+            CfgNode({'pass': 1, 'num_int': 'pass'}).eval()
+
+
+class UndefinedNameCase(Case):
+    config_file = 'tests/configs/undefined_name.yml'
+    evaluate = True
+
+    def check(self) -> None:
+        with pytest.raises(NameError):
+            self.load_config()
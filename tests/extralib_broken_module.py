@@ -0,0 +1 @@
+raise ImportError('This module always fails to import.')
@@ -1,7 +1,14 @@
+from collections import namedtuple
+
 import pytest
 from cases.case import Case
-from cases.config import (FileNotFoundCase, LackOfKeyExtralibCase, NotEvalCase,
-                          RegularCase, UnwantedKeyExtralibCase)
+from cases.config import (BrokenExtralibCase, EvalKeepsOriginalCase,
+                          ExpressionCase, FileNotFoundCase,
+                          ForwardReferenceCase, LackOfKeyExtralibCase,
+                          LazyExtralibCase, MissingExtralibCase,
+                          ModuleExtralibCase, NotEvalCase, RegularCase,
+                          SubmoduleExtralibCase, UndefinedNameCase,
+                          UnwantedKeyExtralibCase)
 
 from liberyacs import CfgNode
 
@@ -13,6 +20,15 @@ from liberyacs import CfgNode
         NotEvalCase,
         LackOfKeyExtralibCase,
         UnwantedKeyExtralibCase,
+        EvalKeepsOriginalCase,
+        ModuleExtralibCase,
+        MissingExtralibCase,
+        ForwardReferenceCase,
+        SubmoduleExtralibCase,
+        BrokenExtralibCase,
+        LazyExtralibCase,
+        ExpressionCase,
+        UndefinedNameCase,
     ]
 )
 def test_cfgnode_load(case: Case) -> None:
@@ -28,3 +44,33 @@ def test_dict_assignment() -> None:
     }
 
     assert cfg.key1.key2.key3 == 123
+
+
+def test_dump() -> None:
+    cfg = CfgNode()
+    cfg.key1 = {
+        'key2': {
+            'key3': 123,
+        }
+    }
+
+    assert cfg.dump() == 'key1:\n  key2:\n    key3: 123\n'
+    assert cfg.dump(validate=False) == cfg.dump()
+
+
+def test_init_copies_containers() -> None:
+    inner = [1]
+    cfg = CfgNode({'key1': [([inner], {'key2': (inner,)})]})
+    cfg.key1[0][0][0].append(2)
+    cfg.key1[0][1].key2[0].append(3)
+
+    assert inner == [1]
+
+
+def test_namedtuple_assignment() -> None:
+    Point = namedtuple('Point', ['x', 'y'])
+    cfg = CfgNode()
+    cfg.point = Point(1, 2)
+
+    assert type(cfg.point) is Point
+    assert cfg.point == Point(1, 2)